@@ -1,12 +1,14 @@
 import streamlit as st
-from valuation.data import get_financials, extract_latest_fcf, get_valuation_multiples
-from valuation.dcf import project_cash_flows, calculate_terminal_value_gordon, calculate_terminal_value_exit_multiple, discounted_cash_flows
+from valuation.data import get_financials, get_financials_many, get_valuation_multiples
+from valuation.dcf import cached_projection, calculate_terminal_value_gordon, calculate_terminal_value_exit_multiple, discounted_cash_flows
 from visualizations.charts import dcf_chart
 import numpy as np
 import plotly.express as px
-from visualizations.charts import render_sensitivity_heatmap, render_exit_multiple_heatmap
+from visualizations.charts import render_sensitivity_heatmap, render_exit_multiple_heatmap, render_tornado_chart
 import pandas as pd
 import plotly.graph_objects as go
+from valuation.graph import DependencyGraph
+from valuation.implied import implied_growth
 
 # Open Source Valuation Toolkit
 # This application allows users to perform fundamental company valuations using:
@@ -14,6 +16,26 @@ import plotly.graph_objects as go
 # - Comparables valuation metrics like P/E, PEG, EV/EBITDA
 # The user interface is powered by Streamlit and includes built-in visualizations and explanatory tooltips.
 
+
+def build_dcf_graph():
+    """
+    DCF page as a dependency graph: inputs → projection → terminal → PV → charts.
+    Kept in session state so a rerun recomputes only the nodes downstream of the widget that moved.
+    """
+    graph = DependencyGraph()
+    graph.node("projection", cached_projection, ["fcf", "growth"])
+    graph.node("terminal_gordon", lambda p, tg, r: calculate_terminal_value_gordon(p[-1], tg, r), ["projection", "terminal_growth", "discount"])
+    graph.node("terminal_exit", lambda p, m: calculate_terminal_value_exit_multiple(p[-1], m), ["projection", "exit_multiple"])
+    for m in ("gordon", "exit"):
+        graph.node(f"value_{m}", discounted_cash_flows, ["projection", f"terminal_{m}", "discount"])
+        graph.node(f"chart_{m}", dcf_chart, ["projection", f"terminal_{m}", f"value_{m}"])
+    graph.node("heatmap_gordon", render_sensitivity_heatmap, ["fcf", "discount", "terminal_growth", "growth"])
+    graph.node("heatmap_exit", render_exit_multiple_heatmap, ["fcf", "discount", "exit_multiple", "growth"])
+    graph.node("tornado_gordon", render_tornado_chart, ["fcf", "growth", "discount", "terminal_growth"])
+    graph.node("tornado_exit", render_tornado_chart, ["fcf", "growth", "discount", "terminal_growth", "exit_multiple"])
+    return graph
+
+
 st.title("💼 Open Source Valuation Toolkit")
 
 # Valuation method selector
@@ -30,12 +52,11 @@ if valuation_method == "Discounted Cash Flow (DCF)":
     # Single ticker input
     if ticker:
         financials = get_financials(ticker)
-        currency = financials.get("currency", "N/A")
+        currency = financials.currency
         st.caption(f"All valuation outputs below are in {currency}.")
-        st.write(f"**Company Name:** {financials['info'].get('longName', 'N/A')}")
+        st.write(f"**Company Name:** {financials.info.get('longName', 'N/A')}")
 
-        cashflow_df = financials['cashflow']
-        latest_fcf = extract_latest_fcf(cashflow_df)
+        latest_fcf = financials.latest_fcf
 
         if latest_fcf is None:
             st.error("⚠️ Free Cash Flow data not available for this ticker.")
@@ -67,7 +88,7 @@ if valuation_method == "Discounted Cash Flow (DCF)":
         if use_auto_wacc:
             rf = 0.045  # Assume 4.5% risk-free rate
             market_return = 0.09  # Assume 9% long-term market return
-            beta = financials['info'].get('beta', 1.0)
+            beta = financials.info.get('beta', 1.0)
 
             cost_of_equity = rf + beta * (market_return - rf)
             discount_rate = cost_of_equity
@@ -80,7 +101,10 @@ if valuation_method == "Discounted Cash Flow (DCF)":
             ) / 100
 
 
-        projected = project_cash_flows(latest_fcf, growth_rate)
+        if "dcf_graph" not in st.session_state:
+            st.session_state.dcf_graph = build_dcf_graph()
+        graph = st.session_state.dcf_graph
+        graph.set_inputs(fcf=latest_fcf, growth=growth_rate, terminal_growth=terminal_growth, discount=discount_rate)
 
         # Terminal value method selection
         st.subheader("🏋️ Terminal Value Method")
@@ -92,12 +116,14 @@ if valuation_method == "Discounted Cash Flow (DCF)":
 
 
         if method == "Gordon Growth":
-            terminal = calculate_terminal_value_gordon(projected[-1], terminal_growth, discount_rate)
+            variant = "gordon"
         else:
             exit_multiple = st.slider("Select exit multiple of FCF", 5, 25, 12)
-            terminal = calculate_terminal_value_exit_multiple(projected[-1], exit_multiple)
+            graph.set_inputs(exit_multiple=exit_multiple)
+            variant = "exit"
 
-        total_value = discounted_cash_flows(projected, terminal, discount_rate)
+        terminal = graph.get(f"terminal_{variant}")
+        total_value = graph.get(f"value_{variant}")
 
         # DCF Value Output
         st.subheader("💵 DCF Valuation")
@@ -116,11 +142,16 @@ if valuation_method == "Discounted Cash Flow (DCF)":
         """)
 
         # Market comparison
-        market_price = financials['info'].get('currentPrice', None)
-        shares_outstanding = financials['info'].get('sharesOutstanding', None)
+        market_price = financials.info.get('currentPrice', None)
+        shares_outstanding = financials.info.get('sharesOutstanding', None)
 
         if market_price and shares_outstanding:
             implied_price = total_value / shares_outstanding
+            market_growth = implied_growth(
+                market_price * shares_outstanding, latest_fcf, discount_rate, terminal_growth,
+                exit_multiple=exit_multiple if variant == "exit" else None
+            )
+            market_growth_text = "N/A" if np.isnan(market_growth) else f"{market_growth*100:.1f}%"
             if implied_price > market_price:
                 valuation_label = "🔼 Undervalued"
                 valuation_tip = "Intrinsic > Market — The stock may be trading below its fair value, potentially offering upside."
@@ -145,6 +176,7 @@ if valuation_method == "Discounted Cash Flow (DCF)":
 
             - **Market Price:** ${market_price}  
             - **Implied Intrinsic Price:** ${implied_price:,.2f}  
+            - **Market-Implied FCF Growth:** {market_growth_text}  
             - **Valuation vs Market:**  
             <span style="font-weight:bold;">{valuation_label}</span>
             <span class="tooltip-icon" title="{valuation_tip}">ℹ️</span>
@@ -152,22 +184,15 @@ if valuation_method == "Discounted Cash Flow (DCF)":
 
 
         # DCF Chart
-        st.plotly_chart(dcf_chart(projected, terminal, total_value))
+        st.plotly_chart(graph.get(f"chart_{variant}"))
         
         # Sensitivity Chart
         st.subheader("📊 Sensitivity Heatmap")
-        if method == "Gordon Growth":
-            fig = render_sensitivity_heatmap(
-                latest_fcf, discount_rate, terminal_growth,
-                project_cash_flows, calculate_terminal_value_gordon, discounted_cash_flows
-            )
-            st.plotly_chart(fig)
-        else:
-            fig = render_exit_multiple_heatmap(
-                latest_fcf, discount_rate, exit_multiple,
-                project_cash_flows, calculate_terminal_value_exit_multiple, discounted_cash_flows
-            )
-            st.plotly_chart(fig)
+        st.plotly_chart(graph.get(f"heatmap_{variant}"))
+
+        # Tornado Chart
+        st.subheader("🌪️ Tornado Chart")
+        st.plotly_chart(graph.get(f"tornado_{variant}"))
 
     # Multiple Ticker DCF Comparison
     st.subheader("📊 Compare Multiple Tickers")
@@ -178,10 +203,11 @@ if valuation_method == "Discounted Cash Flow (DCF)":
         ticker_list = [t.strip().upper() for t in tickers.split(",")][:5]
         comparison = []
 
-        for t in ticker_list:
+        for t, f, error in get_financials_many(ticker_list, fields=("cashflow", "info")):
             try:
-                f = get_financials(t)
-                fcf = extract_latest_fcf(f['cashflow'])
+                if error is not None:
+                    raise error
+                fcf = f.latest_fcf
                 if fcf is None:
                     raise ValueError("No FCF")
 
@@ -189,7 +215,7 @@ if valuation_method == "Discounted Cash Flow (DCF)":
                 discount = 0.10
                 exit_multiple = 12
 
-                proj = project_cash_flows(fcf, growth)
+                proj = cached_projection(fcf, growth)
                 
                 # Gordon Growth Valuation
                 term_gordon = calculate_terminal_value_gordon(proj[-1], 0.02, discount)
@@ -201,10 +227,10 @@ if valuation_method == "Discounted Cash Flow (DCF)":
 
 
                 # Current Market Price
-                market = f['info'].get('currentPrice', None)
+                market = f.info.get('currentPrice', None)
 
                 # Share Price Conversion
-                shares = f['info'].get('sharesOutstanding', None)
+                shares = f.info.get('sharesOutstanding', None)
                 intrinsic_gordon = value_gordon / shares if shares else None
                 intrinsic_exit = value_exit / shares if shares else None
 
@@ -217,14 +243,15 @@ if valuation_method == "Discounted Cash Flow (DCF)":
                     "Valuation (Exit)": "Undervalued" if intrinsic_exit and market and intrinsic_exit > market else "Overvalued"
                 })
 
-            except:
+            except Exception as exc:
                 comparison.append({
                     "Ticker": t,
                     "Market Price": "N/A",
                     "Intrinsic (Gordon)": "N/A",
                     "Intrinsic (Exit Multiple)": "N/A",
                     "Valuation (Gordon)":"N/A",
-                    "Valuation (Exit)": "N/A"
+                    "Valuation (Exit)": "N/A",
+                    "Error": str(exc) or type(exc).__name__
                 })
 
         st.dataframe(comparison)
@@ -236,9 +263,9 @@ elif valuation_method == "Dividend Discount Model (DDM)":
 
     if ticker:
         financials = get_financials(ticker)
-        currency = financials.get("currency", "N/A")
+        currency = financials.currency
         st.caption(f"All valuation outputs below are in {currency}.")
-        info = financials["info"]
+        info = financials.info
 
         st.write(f"**Company Name:** {info.get('longName', 'N/A')}")
 
@@ -318,18 +345,19 @@ elif valuation_method == "Valuation Multiples (Comps)":
         ticker_list = [t.strip().upper() for t in tickers.split(",")][:5]
         metrics_table = []
 
-        for t in ticker_list:
+        for t, fin, error in get_financials_many(ticker_list, fields=("info",)):
             try:
-                fin = get_financials(t)
-                info = fin["info"]
+                if error is not None:
+                    raise error
+                info = fin.info
                 multiples = get_valuation_multiples(info)
 
                 row = {"Ticker": t}
                 row.update(multiples)
                 row["Sector"] = info.get("sector", "N/A")
                 metrics_table.append(row)
-            except:
-                metrics_table.append({"Ticker": t, "Error": "Data unavailable or failed to fetch."})
+            except Exception as exc:
+                metrics_table.append({"Ticker": t, "Error": f"Data unavailable or failed to fetch: {str(exc) or type(exc).__name__}"})
 
         if metrics_table:
             df = pd.DataFrame(metrics_table)
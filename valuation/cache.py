@@ -0,0 +1,169 @@
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+DEFAULT_CACHE_PATH = os.environ.get(
+    "VALUATION_CACHE_PATH",
+    os.path.join(os.path.expanduser("~"), ".cache", "valuation-toolkit", "financials.sqlite")
+)
+
+# Annual statements only change when a new fiscal year is reported, quotes move all day.
+STATEMENT_TTL = 3 * 24 * 60 * 60
+INFO_TTL = 15 * 60
+
+# Failed lookups (unknown ticker, empty statement, no FCF) are remembered briefly
+# so reruns fail fast while a ticker that starts reporting is picked up soon after.
+NEGATIVE_TTL = 10 * 60
+
+DEFAULT_MEMORY_BYTES = 256 * 1024 * 1024
+
+FIELD_TTLS = {
+    "income": STATEMENT_TTL,
+    "cashflow": STATEMENT_TTL,
+    "balance": STATEMENT_TTL,
+    "info": INFO_TTL,
+}
+
+
+class DiskCache:
+    """
+    Persistent key/value store backed by a local SQLite file.
+    Entries are stored with their write time; freshness is decided at read time
+    from the TTL the caller passes, so one store can hold fields with different TTLs.
+    """
+
+    def __init__(self, path=DEFAULT_CACHE_PATH):
+        self.path = path
+        self._conn = None
+        self._lock = threading.Lock()
+
+    def _connect(self):
+        if self._conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS entries (key TEXT PRIMARY KEY, stored_at REAL, payload BLOB)"
+            )
+        return self._conn
+
+    def get_entry(self, key):
+        """
+        Returns (value, stored_at) for key regardless of age, or None if absent.
+        """
+        with self._lock:
+            row = self._connect().execute(
+                "SELECT stored_at, payload FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None:
+            return None
+        return pickle.loads(row[1]), row[0]
+
+    def get(self, key, ttl):
+        """
+        Returns the cached value for key if it is younger than ttl seconds, else None.
+        """
+        entry = self.get_entry(key)
+        if entry is None or time.time() - entry[1] > ttl:
+            return None
+        return entry[0]
+
+    def set(self, key, value):
+        payload = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        with self._lock:
+            conn = self._connect()
+            conn.execute(
+                "INSERT OR REPLACE INTO entries (key, stored_at, payload) VALUES (?, ?, ?)",
+                (key, time.time(), payload)
+            )
+            conn.commit()
+
+    def touch(self, key):
+        """
+        Marks an entry as freshly validated without rewriting its payload.
+        """
+        with self._lock:
+            conn = self._connect()
+            conn.execute("UPDATE entries SET stored_at = ? WHERE key = ?", (time.time(), key))
+            conn.commit()
+
+    def delete(self, key):
+        with self._lock:
+            conn = self._connect()
+            conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+            conn.commit()
+
+    def clear(self):
+        with self._lock:
+            conn = self._connect()
+            conn.execute("DELETE FROM entries")
+            conn.commit()
+
+
+def sizeof(value):
+    """
+    Approximate in-memory size of a cached payload in bytes.
+    """
+    if hasattr(value, "memory_usage"):
+        return int(value.memory_usage(index=True, deep=True).sum())
+    return len(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+
+
+class MemoryLRU:
+    """
+    Process-wide in-memory cache shared by every session, evicting least recently used
+    entries once the total payload size exceeds max_bytes. Values are shared, not copied,
+    so callers must treat them as read-only.
+    """
+
+    def __init__(self, max_bytes=DEFAULT_MEMORY_BYTES):
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._bytes = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, ttl):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or time.time() - entry[1] > ttl:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def set(self, key, value, stored_at=None):
+        nbytes = sizeof(value)
+        if nbytes > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old[2]
+            self._entries[key] = (value, time.time() if stored_at is None else stored_at, nbytes)
+            self._bytes += nbytes
+            while self._bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= evicted[2]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self):
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+            }
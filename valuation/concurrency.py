@@ -0,0 +1,120 @@
+import random
+import threading
+import time
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls that share a key.
+    The first caller for a key runs the function; callers arriving while it is in flight
+    block until it finishes and receive the same result (or the same exception).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+
+    def do(self, key, fn, *args):
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.value
+
+        try:
+            call.value = fn(*args)
+        except BaseException as exc:
+            call.error = exc
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.value
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket: allows bursts of up to `capacity` calls and a sustained
+    `rate` calls per second. acquire() blocks until a token is available.
+    """
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+class RetryBudget:
+    """
+    Caps retries to a fraction of traffic so a struggling upstream is not hammered.
+    Every request deposits `ratio` tokens (up to `max_tokens`) and every retry spends one.
+    """
+
+    def __init__(self, ratio=0.2, min_tokens=10, max_tokens=50):
+        self.ratio = ratio
+        self.max_tokens = max_tokens
+        self._tokens = min_tokens
+        self._lock = threading.Lock()
+
+    def deposit(self):
+        with self._lock:
+            self._tokens = min(self.max_tokens, self._tokens + self.ratio)
+
+    def withdraw(self):
+        with self._lock:
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+            return True
+
+
+def call_with_retry(fn, *args, limiter=None, budget=None, retryable=lambda exc: False,
+                    max_attempts=4, base_delay=0.5, max_delay=8.0):
+    """
+    Calls fn(*args), taking a limiter token before every attempt.
+    Retryable failures are retried with full-jitter exponential backoff while attempts
+    and the shared retry budget last; anything else is raised immediately.
+    """
+    if budget is not None:
+        budget.deposit()
+    attempt = 0
+    while True:
+        if limiter is not None:
+            limiter.acquire()
+        try:
+            return fn(*args)
+        except Exception as exc:
+            attempt += 1
+            if attempt >= max_attempts or not retryable(exc):
+                raise
+            if budget is not None and not budget.withdraw():
+                raise
+            time.sleep(random.uniform(0, min(max_delay, base_delay * 2 ** (attempt - 1))))
@@ -1,21 +1,329 @@
-import yfinance as yf
+import asyncio
+import os
+import threading
+import time
 import numpy as np
+import pandas as pd
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from valuation.cache import DiskCache, MemoryLRU, FIELD_TTLS, NEGATIVE_TTL
+from valuation.concurrency import SingleFlight, TokenBucket, RetryBudget, call_with_retry
+from valuation.providers import YFinanceProvider, FixtureProvider, STATEMENT_FIELDS
 
-def get_financials(ticker):
-    stock = yf.Ticker(ticker)
-    income = stock.financials
-    cashflow = stock.cashflow
-    balance = stock.balance_sheet
-    info = stock.info
-    currency = info.get("financialCurrency", "N/A")
+_cache = DiskCache()
+_memory = MemoryLRU()
+# Negative results live only in memory: they expire after minutes and must not pile up on disk.
+_negative = MemoryLRU(max_bytes=1024 * 1024)
+_flight = SingleFlight()
 
-    return {
-        "income": income,
-        "cashflow": cashflow,
-        "balance": balance,
-        "info": info,
-        "currency": currency
-    }
+# Shared across threads so bulk fetches stay under the upstream's request limits.
+_limiter = TokenBucket(rate=4, capacity=8)
+_retry_budget = RetryBudget()
+
+# VALUATION_FIXTURES_DIR switches the whole app to offline fixture data.
+if os.environ.get("VALUATION_FIXTURES_DIR"):
+    _provider = FixtureProvider(os.environ["VALUATION_FIXTURES_DIR"])
+else:
+    _provider = YFinanceProvider()
+
+# Worker threads for the async API. A semaphore caps downloads in flight, but never above the
+# pool size, so get_financials_many_async grows the pool to its `concurrency` when needed.
+DEFAULT_ASYNC_CONCURRENCY = 16
+_async_workers = DEFAULT_ASYNC_CONCURRENCY
+_async_executor = ThreadPoolExecutor(max_workers=_async_workers, thread_name_prefix="valuation-async")
+_async_lock = threading.Lock()
+
+TickerResult = namedtuple("TickerResult", ["ticker", "snapshot", "error"])
+
+
+def get_provider():
+    return _provider
+
+
+def set_provider(provider):
+    """
+    Replaces the default data provider used when get_financials is called without one.
+    """
+    global _provider
+    _provider = provider
+
+
+def _is_empty(value):
+    if value is None:
+        return True
+    if hasattr(value, "empty"):
+        return value.empty
+    return len(value) == 0
+
+
+def cache_stats():
+    """
+    Hit/miss counters and current size of the process-wide in-memory cache.
+    """
+    return _memory.stats()
+
+
+def _empty(field):
+    return {} if field == "info" else pd.DataFrame()
+
+
+def _looks_unknown(info):
+    # yfinance answers unknown symbols with an (almost) empty info dict rather than an error
+    return not (info.get("quoteType") or info.get("longName") or info.get("shortName"))
+
+
+def _negative_key(provider, ticker, what):
+    return f"neg:{provider.name}:{ticker}:{what}"
+
+
+def _record_negative(provider, ticker, what, reason):
+    _negative.set(_negative_key(provider, ticker, what), reason)
+
+
+def _is_negative(provider, ticker, what):
+    return _negative.get(_negative_key(provider, ticker, what), NEGATIVE_TTL) is not None
+
+
+def _fetch_field(provider, ticker, field):
+    """
+    Serves a field from the process-wide memory cache or the on-disk cache while it is fresh,
+    otherwise asks the provider.
+    Concurrent misses for the same ticker and field share one upstream fetch.
+    Empty payloads are not cached on disk: they go into a short-TTL in-memory negative cache so
+    repeated lookups of unknown or data-less tickers return the empty payload without a fetch.
+    Failed fetches raise and are not cached at all, so the next lookup tries upstream again.
+    """
+    if not provider.cacheable:
+        return provider.fetch(ticker, field)
+
+    key = f"{provider.name}:{ticker}:{field}"
+    value = _memory.get(key, FIELD_TTLS[field])
+    if value is not None:
+        return value
+    if _is_negative(provider, ticker, field):
+        return _empty(field)
+    entry = _cache.get_entry(key)
+    if entry is not None and time.time() - entry[1] <= FIELD_TTLS[field]:
+        _memory.set(key, entry[0], stored_at=entry[1])
+        return entry[0]
+    return _flight.do(key, _download, provider, key, ticker, field)
+
+
+def _latest_reported_period(info):
+    """
+    End date of the latest fiscal year the company has reported, from info, or None.
+    """
+    end = info.get("lastFiscalYearEnd")
+    if not end:
+        return None
+    return pd.Timestamp(end, unit="s")
+
+
+def _has_new_period(provider, ticker, cached):
+    """
+    True when info reports a fiscal year end past the newest column of a cached statement.
+    Period columns and lastFiscalYearEnd can disagree by a few days, hence the slack.
+    """
+    reported = _latest_reported_period(_fetch_field(provider, ticker, "info"))
+    if reported is None or cached.empty:
+        return True
+    return reported > pd.Timestamp(max(cached.columns)) + pd.Timedelta(days=31)
+
+
+def _merge_statement(fresh, cached):
+    # Newly fetched periods win; older periods that dropped out of the upstream window are kept.
+    merged = fresh.combine_first(cached)
+    return merged[sorted(merged.columns, reverse=True)]
+
+
+def _download(provider, key, ticker, field):
+    """
+    Fetches a field from the provider and stores it.
+    An expired statement is only refetched when a new fiscal period has been reported; otherwise
+    the cached copy is revalidated in place. A refetched statement is merged into the cached
+    history so periods beyond the upstream's window are retained.
+    Only a successful response is negative-cached: an unknown symbol, or a field with no data.
+    Provider errors that outlast the retries propagate and leave both caches untouched.
+    """
+    # Re-check under single-flight: a fetch that just finished may already have filled the cache.
+    entry = _cache.get_entry(key)
+    if entry is not None and time.time() - entry[1] <= FIELD_TTLS[field]:
+        return entry[0]
+
+    cached = entry[0] if entry is not None and field in STATEMENT_FIELDS else None
+    if cached is not None and not _has_new_period(provider, ticker, cached):
+        _cache.touch(key)
+        _memory.set(key, cached)
+        return cached
+
+    value = call_with_retry(
+        provider.fetch, ticker, field,
+        limiter=_limiter, budget=_retry_budget, retryable=provider.is_retryable
+    )
+    if field == "info" and (_is_empty(value) or _looks_unknown(value)):
+        for what in STATEMENT_FIELDS + ("info",):
+            _record_negative(provider, ticker, what, "no such ticker")
+    elif _is_empty(value):
+        _record_negative(provider, ticker, field, "no data")
+    else:
+        if cached is not None:
+            value = _merge_statement(value, cached)
+        _cache.set(key, value)
+        _memory.set(key, value)
+    return value
+
+
+class FinancialSnapshot:
+    """
+    Lazily loaded financial data for one ticker.
+    Each of income, cashflow, balance and info is fetched on first access and memoized,
+    so a page only pays for the payloads it actually reads.
+    """
+
+    def __init__(self, ticker, provider=None):
+        self.ticker = ticker.upper()
+        self.provider = provider or _provider
+        self._fields = {}
+
+    def _get(self, field):
+        if field not in self._fields:
+            self._fields[field] = _fetch_field(self.provider, self.ticker, field)
+        return self._fields[field]
+
+    @property
+    def income(self):
+        return self._get("income")
+
+    @property
+    def cashflow(self):
+        return self._get("cashflow")
+
+    @property
+    def balance(self):
+        return self._get("balance")
+
+    @property
+    def info(self):
+        return self._get("info")
+
+    @property
+    def currency(self):
+        return self.info.get("financialCurrency", "N/A")
+
+    @property
+    def latest_fcf(self):
+        """
+        Latest free cash flow from the cashflow statement, or None if it cannot be derived.
+        A missing FCF is negative-cached so later lookups skip the statement entirely.
+        """
+        if self.provider.cacheable and _is_negative(self.provider, self.ticker, "fcf"):
+            return None
+        fcf = extract_latest_fcf(self.cashflow)
+        if fcf is None and self.provider.cacheable:
+            _record_negative(self.provider, self.ticker, "fcf", "no FCF")
+        return fcf
+
+    def load(self, *fields):
+        """
+        Eagerly fetches the given fields and returns the snapshot.
+        """
+        for field in fields:
+            self._get(field)
+        return self
+
+
+def get_financials(ticker, provider=None):
+    return FinancialSnapshot(ticker, provider)
+
+
+def _load_ticker(ticker, fields, provider):
+    try:
+        return TickerResult(ticker, get_financials(ticker, provider).load(*fields), None)
+    except Exception as exc:
+        return TickerResult(ticker, None, exc)
+
+
+def get_financials_many(tickers, fields=("cashflow", "info"), max_workers=8, provider=None):
+    """
+    Fetches several tickers concurrently on a bounded thread pool.
+    Returns one TickerResult per ticker in input order; a ticker that fails carries
+    its exception in `error` (and `snapshot` is None) instead of aborting the batch.
+    """
+    tickers = list(tickers)
+    if not tickers:
+        return []
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(tickers))) as pool:
+        return list(pool.map(lambda t: _load_ticker(t, fields, provider), tickers))
+
+
+def _grow_async_pool(workers):
+    """
+    Replaces the async worker pool with a larger one when fewer than `workers` threads are available.
+    Downloads already running on the old pool finish there.
+    """
+    global _async_executor, _async_workers
+    with _async_lock:
+        if workers > _async_workers:
+            _async_executor.shutdown(wait=False)
+            _async_executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="valuation-async")
+            _async_workers = workers
+
+
+async def get_financials_async(ticker, fields=("cashflow", "info"), timeout=None, semaphore=None, provider=None):
+    """
+    Async counterpart of get_financials that eagerly loads `fields`.
+    yfinance is blocking, so the download runs on a worker thread; `semaphore` caps how many
+    downloads are in flight so many awaiting requests share a small pool of threads.
+    Raises asyncio.TimeoutError if waiting for a semaphore slot plus the download exceeds
+    `timeout` seconds.
+    A cancelled or timed-out request stops waiting immediately, but its semaphore slot is only
+    released once the worker thread actually finishes (its result still lands in the cache),
+    so the concurrency cap holds for upstream fetches, not just for waiting coroutines.
+    """
+    return await asyncio.wait_for(_run_async(ticker, fields, semaphore, provider), timeout)
+
+
+async def _run_async(ticker, fields, semaphore, provider):
+    if semaphore is not None:
+        await semaphore.acquire()
+    try:
+        future = _async_executor.submit(get_financials(ticker, provider).load, *fields)
+    except BaseException:
+        if semaphore is not None:
+            semaphore.release()
+        raise
+    if semaphore is not None:
+        loop = asyncio.get_running_loop()
+        future.add_done_callback(lambda _: _release_threadsafe(loop, semaphore))
+    return await asyncio.wrap_future(future)
+
+
+def _release_threadsafe(loop, semaphore):
+    try:
+        loop.call_soon_threadsafe(semaphore.release)
+    except RuntimeError:
+        # The event loop has already closed; nobody is left waiting on the semaphore
+        pass
+
+
+async def _load_ticker_async(ticker, fields, timeout, semaphore, provider):
+    try:
+        return TickerResult(ticker, await get_financials_async(ticker, fields, timeout, semaphore, provider), None)
+    except Exception as exc:
+        return TickerResult(ticker, None, exc)
+
+
+async def get_financials_many_async(tickers, fields=("cashflow", "info"), concurrency=DEFAULT_ASYNC_CONCURRENCY,
+                                    timeout=None, provider=None):
+    """
+    Async counterpart of get_financials_many.
+    At most `concurrency` downloads run at once and each ticker gets its own `timeout`.
+    Returns TickerResult tuples in input order with per-ticker errors; cancelling the
+    awaiting task cancels every pending ticker.
+    """
+    _grow_async_pool(concurrency)
+    semaphore = asyncio.Semaphore(concurrency)
+    return await asyncio.gather(*(_load_ticker_async(t, fields, timeout, semaphore, provider) for t in tickers))
 
 
 def extract_latest_fcf(cashflow_df):
@@ -1,8 +1,18 @@
+import functools
 import numpy as np
 
 def project_cash_flows(cash_flows, growth_rate, years=5):
     return [cash_flows * ((1 + growth_rate) ** i) for i in range(1, years + 1)]
 
+@functools.lru_cache(maxsize=512)
+def cached_projection(cash_flows, growth_rate, years=5):
+    """
+    Memoized project_cash_flows shared by every caller in the process, keyed on
+    (cash_flows, growth_rate, years) with LRU eviction. Returns a tuple so the shared
+    result cannot be mutated by one caller under another.
+    """
+    return tuple(project_cash_flows(cash_flows, growth_rate, years))
+
 def calculate_terminal_value_gordon(fcf, terminal_growth, discount_rate):
     """
     Calculates terminal value using the Gordon Growth Model.
@@ -16,6 +26,170 @@ def calculate_terminal_value_exit_multiple(fcf, exit_multiple):
     return fcf * exit_multiple
 
 
+def discount_factors(rates):
+    """
+    Cumulative discount factors for per-year discount rates (term structure or time-varying
+    WACC) along the trailing axis: factor t = 1 / ((1 + r_1) * ... * (1 + r_t)).
+    Compute once and pass as `factors` to the batch valuations: the curve is shared by every
+    valuation, sets the horizon, and `discount` then only gives the Gordon terminal value's rate.
+    """
+    return 1 / np.cumprod(1 + np.asarray(rates, dtype=float), axis=-1)
+
+
 def discounted_cash_flows(projected, terminal, discount_rate):
+    """
+    Present value of projected cash flows plus a terminal value received in the final year.
+    discount_rate is a flat rate or a per-year vector with one rate per projected year.
+    """
+    if np.ndim(discount_rate):
+        factors = discount_factors(discount_rate)
+        return np.dot(projected, factors) + terminal * factors[-1]
     return sum([cf / ((1 + discount_rate) ** (i + 1)) for i, cf in enumerate(projected)]) + terminal / ((1 + discount_rate) ** len(projected))
 
+
+def pv_growing_annuity(fcf, growth_rate, discount_rate, years=5):
+    """
+    Closed-form present value of `years` cash flows growing at a constant rate from fcf,
+    i.e. discounted_cash_flows(project_cash_flows(fcf, growth_rate, years), 0, discount_rate)
+    in O(1) via the geometric-series sum. Falls back to the explicit sum, fcf * years,
+    when growth equals discount. Accepts scalars or broadcastable arrays.
+    """
+    fcf = np.asarray(fcf, dtype=float)
+    growth_rate = np.asarray(growth_rate, dtype=float)
+    discount_rate = np.asarray(discount_rate, dtype=float)
+    years = np.asarray(years)
+
+    # q = 1 + d is the per-year growth-over-discount ratio; expm1/log1p keep q^n - 1 accurate near q = 1.
+    d = (growth_rate - discount_rate) / (1 + discount_rate)
+    flat = d == 0
+    d_safe = np.where(flat, 1.0, d)
+    series = (1 + d_safe) * np.expm1(years * np.log1p(d_safe)) / d_safe
+    return fcf * np.where(flat, years, series)
+
+
+def dcf_batch(fcf, growth, discount, terminal_growth=0.02, years=None, exit_multiple=None, factors=None):
+    """
+    Vectorized DCF over NumPy arrays of tickers and assumptions.
+    fcf, growth, discount, terminal_growth, years and exit_multiple broadcast against each other,
+    and the result has their broadcast shape. Uses the Gordon Growth terminal value unless
+    exit_multiple is given. Each valuation is O(1) regardless of horizon; years defaults to 5.
+    `factors` (see discount_factors) replaces flat discounting; years must then match its length.
+    """
+    fcf = np.asarray(fcf, dtype=float)
+    growth = np.asarray(growth, dtype=float)
+    discount = np.asarray(discount, dtype=float)
+
+    if factors is not None:
+        horizon = np.shape(factors)[-1]
+        if years is not None and np.any(np.asarray(years) != horizon):
+            raise ValueError(f"years must match the length of the discount factor curve ({horizon})")
+        schedule = np.broadcast_to(growth[..., None], growth.shape + (horizon,))
+        return dcf_schedule(fcf, schedule, discount, terminal_growth, exit_multiple, factors)
+
+    years = np.asarray(5 if years is None else years)
+    final = fcf * (1 + growth) ** years
+    if exit_multiple is None:
+        terminal = calculate_terminal_value_gordon(final, np.asarray(terminal_growth, dtype=float), discount)
+    else:
+        terminal = calculate_terminal_value_exit_multiple(final, np.asarray(exit_multiple, dtype=float))
+    return pv_growing_annuity(fcf, growth, discount, years) + terminal / (1 + discount) ** years
+
+
+def _series_slope(d, years):
+    """
+    d/dq of sum(q ** i for i in 1..years) at q = 1 + d.
+    Uses a Taylor expansion around q = 1, where the closed form loses precision to cancellation.
+    """
+    n = years
+    small = np.abs(d) < 1e-4
+    d_safe = np.where(small, 1.0, d)
+    e = np.expm1(n * np.log1p(d_safe))
+    closed = e / d_safe + (1 + d_safe) * (n * (1 + d_safe) ** (n - 1) * d_safe - e) / d_safe ** 2
+    taylor = n * (n + 1) / 2 + d * (n + 1) * n * (n - 1) / 3 + d ** 2 * (n + 1) * n * (n - 1) * (n - 2) / 8
+    return np.where(small, taylor, closed)
+
+
+def dcf_greeks(fcf, growth, discount, terminal_growth=0.02, years=5, exit_multiple=None):
+    """
+    dcf_batch value together with its analytic first-order sensitivities.
+    Returns a dict with "value" and the partial derivative of value with respect to
+    "fcf", "growth", "discount" and either "terminal_growth" (Gordon Growth) or
+    "exit_multiple", each broadcast like dcf_batch, from a single evaluation.
+    """
+    fcf = np.asarray(fcf, dtype=float)
+    growth = np.asarray(growth, dtype=float)
+    discount = np.asarray(discount, dtype=float)
+    years = np.asarray(years)
+
+    # value = fcf * (S + q^n * T) with q = (1 + g) / (1 + r), S = sum(q^i), T the terminal multiple of final FCF
+    q = (1 + growth) / (1 + discount)
+    d = (growth - discount) / (1 + discount)
+    series = pv_growing_annuity(1.0, growth, discount, years)
+    slope = _series_slope(d, years)
+    q_n = q ** years
+
+    if exit_multiple is None:
+        terminal_growth = np.asarray(terminal_growth, dtype=float)
+        spread = discount - terminal_growth
+        multiple = (1 + terminal_growth) / spread
+        d_multiple_d_discount = -(1 + terminal_growth) / spread ** 2
+    else:
+        multiple = np.asarray(exit_multiple, dtype=float)
+        d_multiple_d_discount = 0.0
+
+    d_value_d_q = fcf * (slope + years * q ** (years - 1) * multiple)
+    greeks = {
+        "value": fcf * (series + q_n * multiple),
+        "fcf": series + q_n * multiple,
+        "growth": d_value_d_q / (1 + discount),
+        "discount": -d_value_d_q * q / (1 + discount) + fcf * q_n * d_multiple_d_discount,
+    }
+    if exit_multiple is None:
+        greeks["terminal_growth"] = fcf * q_n * (1 + discount) / spread ** 2
+    else:
+        greeks["exit_multiple"] = fcf * q_n
+    return greeks
+
+
+def fade_growth_schedule(high_growth, terminal_growth, high_years=5, fade_years=5):
+    """
+    Multi-stage growth-rate matrix: high_growth for `high_years`, then a linear fade to
+    terminal_growth over `fade_years`. high_growth and terminal_growth broadcast (e.g. one per
+    ticker); the result gains a trailing year axis of length high_years + fade_years.
+    """
+    high_growth = np.asarray(high_growth, dtype=float)[..., None]
+    terminal_growth = np.asarray(terminal_growth, dtype=float)[..., None]
+    t = np.arange(1, high_years + fade_years + 1)
+    weight = np.clip((t - high_years) / max(fade_years, 1), 0.0, 1.0)
+    return high_growth + (terminal_growth - high_growth) * weight
+
+
+def project_cash_flows_schedule(fcf, growth_schedule):
+    """
+    Projects cash flows under per-year growth rates (trailing axis = year) with a cumulative
+    product, for any number of tickers at once.
+    """
+    growth_schedule = np.asarray(growth_schedule, dtype=float)
+    return np.asarray(fcf, dtype=float)[..., None] * np.cumprod(1 + growth_schedule, axis=-1)
+
+
+def dcf_schedule(fcf, growth_schedule, discount, terminal_growth=0.02, exit_multiple=None, factors=None):
+    """
+    Vectorized DCF for year-by-year growth schedules such as fade_growth_schedule.
+    The horizon is the length of the schedule's year axis; the terminal value follows the
+    final projected year (Gordon Growth unless exit_multiple is given; `factors` as in discount_factors).
+    """
+    projected = project_cash_flows_schedule(fcf, growth_schedule)
+    years = projected.shape[-1]
+    discount = np.asarray(discount, dtype=float)
+    if factors is None:
+        factors = (1 + discount[..., None]) ** -np.arange(1, years + 1)
+    else:
+        factors = np.asarray(factors, dtype=float)
+
+    final = projected[..., -1]
+    if exit_multiple is None:
+        terminal = calculate_terminal_value_gordon(final, np.asarray(terminal_growth, dtype=float), discount)
+    else:
+        terminal = calculate_terminal_value_exit_multiple(final, np.asarray(exit_multiple, dtype=float))
+    return (projected * factors).sum(axis=-1) + terminal * factors[..., -1]
@@ -0,0 +1,65 @@
+import numpy as np
+from valuation.dcf import dcf_batch
+
+
+def _bisect(f, lo, hi, tol=1e-8, max_iter=100):
+    """
+    Vectorized bisection: finds x in [lo, hi] with f(x) = 0 independently for every element.
+    Elements whose bracket does not contain a sign change come back as NaN.
+    """
+    f_lo = f(lo)
+    f_hi = f(hi)
+    bracketed = np.sign(f_lo) * np.sign(f_hi) <= 0
+
+    for _ in range(max_iter):
+        mid = (lo + hi) / 2
+        f_mid = f(mid)
+        # Keep the half whose endpoints still straddle the root
+        right = np.sign(f_mid) == np.sign(f_lo)
+        lo = np.where(right, mid, lo)
+        f_lo = np.where(right, f_mid, f_lo)
+        hi = np.where(right, hi, mid)
+        if np.all(hi - lo < tol):
+            break
+    return np.where(bracketed, (lo + hi) / 2, np.nan)
+
+
+def _brackets(lo, hi, *args):
+    # Bisection works on full-shape arrays, so broadcast the bracket against every input.
+    shape = np.broadcast_shapes(np.shape(lo), np.shape(hi), *(np.shape(a) for a in args))
+    return np.broadcast_to(lo, shape).astype(float), np.broadcast_to(hi, shape).astype(float)
+
+
+def implied_growth(market_cap, fcf, discount, terminal_growth=0.02, years=5, exit_multiple=None,
+                   lo=-0.5, hi=1.0, tol=1e-8, max_iter=100):
+    """
+    Reverse DCF: the constant FCF growth rate over `years` at which dcf_batch equals market_cap.
+    All arguments broadcast, so one call solves a whole universe; names whose implied growth
+    falls outside [lo, hi] (or cannot be solved) are NaN.
+    """
+    market_cap = np.asarray(market_cap, dtype=float)
+
+    def gap(g):
+        return dcf_batch(fcf, g, discount, terminal_growth, years, exit_multiple) - market_cap
+
+    lo, hi = _brackets(lo, hi, market_cap, fcf, discount, terminal_growth, years, exit_multiple)
+    return _bisect(gap, lo, hi, tol, max_iter)
+
+
+def implied_discount_rate(market_cap, fcf, growth, terminal_growth=0.02, years=5, exit_multiple=None,
+                          lo=None, hi=1.0, tol=1e-8, max_iter=100):
+    """
+    Implied return: the discount rate at which dcf_batch equals market_cap, solved for every
+    ticker and scenario at once so a universe can be ranked in one pass.
+    By default the search starts just above terminal_growth for Gordon Growth (where the
+    terminal value diverges) and at -50% for exit multiples. Unsolvable elements are NaN.
+    """
+    market_cap = np.asarray(market_cap, dtype=float)
+    if lo is None:
+        lo = np.asarray(terminal_growth, dtype=float) + 1e-6 if exit_multiple is None else -0.5
+
+    def gap(r):
+        return dcf_batch(fcf, growth, r, terminal_growth, years, exit_multiple) - market_cap
+
+    lo, hi = _brackets(lo, hi, market_cap, fcf, growth, terminal_growth, years, exit_multiple)
+    return _bisect(gap, lo, hi, tol, max_iter)
@@ -0,0 +1,268 @@
+import warnings
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from scipy.special import ndtri
+from scipy.stats import qmc
+from valuation.dcf import dcf_batch
+
+DEFAULT_CHUNK_SIZE = 2 ** 16
+DEFAULT_BINS = 4096
+DEFAULT_REPLICATES = 16
+
+
+def inverse_cdf(spec, u):
+    """
+    Maps uniforms u in (0, 1) to one assumption's distribution by its inverse CDF.
+    spec is one of ("normal", mean, sd), ("uniform", low, high), ("triangular", low, mode, high).
+    """
+    kind, *args = spec
+    if kind == "normal":
+        return args[0] + args[1] * ndtri(u)
+    if kind == "uniform":
+        return args[0] + (args[1] - args[0]) * u
+    if kind == "triangular":
+        low, mode, high = args
+        split = (mode - low) / (high - low)
+        return np.where(
+            u < split,
+            low + np.sqrt(u * (high - low) * (mode - low)),
+            high - np.sqrt((1 - u) * (high - low) * (high - mode))
+        )
+    raise ValueError(f"Unknown distribution: {kind}")
+
+
+def _uniforms(sampler, size, dims, rng, antithetic=False):
+    """
+    `size` points in the unit hypercube from pseudo-random, scrambled Sobol or Latin hypercube
+    sampling. With antithetic=True only half are drawn and mirrored as 1 - u.
+    """
+    n = (size + 1) // 2 if antithetic else size
+    if sampler == "random":
+        u = rng.random((n, dims))
+    elif sampler == "sobol":
+        with warnings.catch_warnings():
+            # A remainder chunk that is not a power of two only loses a little balance
+            warnings.simplefilter("ignore", UserWarning)
+            u = qmc.Sobol(dims, scramble=True, seed=rng).random(n)
+    elif sampler == "lhs":
+        u = qmc.LatinHypercube(dims, seed=rng).random(n)
+    else:
+        raise ValueError(f"Unknown sampler: {sampler}")
+    if antithetic:
+        u = np.concatenate((u, 1 - u))[:size]
+    # Keep strictly inside (0, 1) so unbounded inverse CDFs stay finite
+    return np.clip(u, 1e-12, 1 - 1e-12)
+
+
+def _draw(assumptions, size, rng, sampler="random", antithetic=False):
+    """
+    Draws `size` joint samples of the assumptions. Each entry is either a constant or a
+    distribution spec (see inverse_cdf); constants are passed through unchanged.
+    """
+    random = [name for name, spec in assumptions.items() if isinstance(spec, tuple)]
+    params = {name: spec for name, spec in assumptions.items() if not isinstance(spec, tuple)}
+    if random:
+        u = _uniforms(sampler, size, len(random), rng, antithetic)
+        for i, name in enumerate(random):
+            params[name] = inverse_cdf(assumptions[name], u[:, i])
+    return params
+
+
+def evaluate_draws(params, years):
+    """
+    Values one chunk of draws; Gordon Growth draws with discount <= terminal growth are NaN.
+    """
+    values = dcf_batch(
+        params["fcf"], params["growth"], params["discount"],
+        params.get("terminal_growth", 0.02), years, params.get("exit_multiple")
+    )
+    if params.get("exit_multiple") is None:
+        values = np.where(params["discount"] > params.get("terminal_growth", 0.02), values, np.nan)
+    return values
+
+
+class ValuationSketch:
+    """
+    Streaming summary of simulated valuations: a fixed-bin histogram with under/overflow
+    bins, plus count, sum, sum of squares and extremes. Percentiles are interpolated within
+    bins, so memory stays constant however many draws are added, and sketches that share
+    edges merge exactly.
+    """
+
+    def __init__(self, edges):
+        self.edges = edges
+        self.counts = np.zeros(len(edges) + 1, dtype=np.int64)
+        self.count = 0
+        self.invalid = 0
+        self.total = 0.0
+        self.total_sq = 0.0
+        self.min = np.inf
+        self.max = -np.inf
+        self.batch_means = []
+        self.batch_counts = []
+
+    @classmethod
+    def from_pilot(cls, values, bins=DEFAULT_BINS):
+        """
+        Sets bin edges from a pilot sample: its 0.1-99.9 percentile range, padded on both sides.
+        """
+        finite = values[np.isfinite(values)]
+        if finite.size == 0:
+            return cls(np.linspace(-1.0, 1.0, bins + 1))
+        lo, hi = np.quantile(finite, [0.001, 0.999])
+        pad = max(hi - lo, abs(hi), 1.0) * 0.5
+        return cls(np.linspace(lo - pad, hi + pad, bins + 1))
+
+    def update(self, values):
+        values = np.asarray(values, dtype=float).ravel()
+        finite = values[np.isfinite(values)]
+        self.invalid += values.size - finite.size
+        if finite.size == 0:
+            return
+        self.counts += np.bincount(np.searchsorted(self.edges, finite, side="right"), minlength=self.counts.size)
+        self.count += finite.size
+        self.total += finite.sum()
+        self.total_sq += np.square(finite).sum()
+        self.min = min(self.min, finite.min())
+        self.max = max(self.max, finite.max())
+        self.batch_means.append(finite.mean())
+        self.batch_counts.append(finite.size)
+
+    def merge(self, other):
+        self.counts += other.counts
+        self.count += other.count
+        self.invalid += other.invalid
+        self.total += other.total
+        self.total_sq += other.total_sq
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self.batch_means.extend(other.batch_means)
+        self.batch_counts.extend(other.batch_counts)
+        return self
+
+    @property
+    def mean(self):
+        return self.total / self.count if self.count else np.nan
+
+    @property
+    def std(self):
+        if self.count < 2:
+            return np.nan
+        return np.sqrt(max(self.total_sq / self.count - self.mean ** 2, 0.0) * self.count / (self.count - 1))
+
+    @property
+    def standard_error(self):
+        """
+        Standard error of the mean from the spread of per-chunk means (batch means), each
+        weighted by its number of valid draws. Each chunk is an independent randomization, so
+        this is valid for pseudo-random, randomized quasi-random and antithetic sampling alike;
+        NaN with fewer than two chunks.
+        """
+        k = len(self.batch_means)
+        if k < 2:
+            return np.nan
+        weights = np.asarray(self.batch_counts) / self.count
+        spread = np.asarray(self.batch_means) - self.mean
+        return np.sqrt(k / (k - 1) * np.sum(np.square(weights * spread)))
+
+    def percentile(self, q):
+        """
+        Approximate percentile(s) q in [0, 100] of the valid draws.
+        """
+        q = np.asarray(q, dtype=float)
+        if self.count == 0:
+            return np.full(q.shape, np.nan)
+        # Bin i spans left[i]..right[i]; the outer bins are bounded by the observed extremes
+        left = np.concatenate(([self.min], self.edges))
+        right = np.concatenate((self.edges, [self.max]))
+        left = np.clip(left, self.min, self.max)
+        right = np.clip(right, self.min, self.max)
+
+        cumulative = np.cumsum(self.counts)
+        target = q / 100 * self.count
+        idx = np.minimum(np.searchsorted(cumulative, target, side="left"), self.counts.size - 1)
+        in_bin = self.counts[idx]
+        frac = np.where(in_bin > 0, (target - (cumulative[idx] - in_bin)) / np.maximum(in_bin, 1), 0.0)
+        return left[idx] + np.clip(frac, 0.0, 1.0) * (right[idx] - left[idx])
+
+
+def _simulate_chunk(assumptions, size, seed_seq, years, sampler, antithetic):
+    rng = np.random.default_rng(seed_seq)
+    params = _draw(assumptions, size, rng, sampler, antithetic)
+    return np.broadcast_to(evaluate_draws(params, years), (size,))
+
+
+def _chunk_sketch(assumptions, size, seed_seq, years, edges, sampler, antithetic):
+    sketch = ValuationSketch(edges)
+    sketch.update(_simulate_chunk(assumptions, size, seed_seq, years, sampler, antithetic))
+    return sketch
+
+
+def iter_monte_carlo_dcf(assumptions, n_draws=1_000_000, years=5, chunk_size=DEFAULT_CHUNK_SIZE,
+                         seed=None, bins=DEFAULT_BINS, workers=None, sampler="random", antithetic=False,
+                         replicates=DEFAULT_REPLICATES):
+    """
+    Monte Carlo DCF evaluated in fixed-size NumPy chunks so memory stays bounded.
+    `assumptions` maps fcf, growth, discount, terminal_growth and (for the exit multiple
+    method) exit_multiple to constants or distribution specs (see inverse_cdf).
+    Yields the running ValuationSketch after every chunk, so callers can stream percentiles
+    and the standard error of the mean.
+
+    sampler is "random", "sobol" (scrambled) or "lhs" (Latin hypercube); low-discrepancy
+    samplers and antithetic=True (mirrored u, 1 - u pairs) cover the assumption space more
+    evenly and reach a given standard error with far fewer draws. Sobol chunks are best kept
+    at a power of two, as the default chunk size is.
+
+    Draws are split into at least `replicates` chunks, however small n_draws is, so the
+    standard error always comes from that many independent randomizations.
+
+    With workers > 1 chunks are fanned out over a process pool. Every chunk draws from its own
+    stream spawned from numpy.random.SeedSequence(seed) and partial sketches are merged in chunk
+    order, so a given seed gives identical results whatever the number of workers.
+    """
+    chunk_size = max(1, min(chunk_size, -(-n_draws // replicates)))
+    sizes = [chunk_size] * (n_draws // chunk_size)
+    if n_draws % chunk_size:
+        sizes.append(n_draws % chunk_size)
+    if not sizes:
+        return
+    streams = np.random.SeedSequence(seed).spawn(len(sizes))
+
+    # The first chunk doubles as the pilot that fixes the histogram edges shared by every worker.
+    values = _simulate_chunk(assumptions, sizes[0], streams[0], years, sampler, antithetic)
+    sketch = ValuationSketch.from_pilot(values, bins)
+    sketch.update(values)
+    yield sketch
+
+    rest = (sizes[1:], streams[1:])
+    if workers is None or workers <= 1:
+        for size, stream in zip(*rest):
+            sketch.merge(_chunk_sketch(assumptions, size, stream, years, sketch.edges, sampler, antithetic))
+            yield sketch
+        return
+
+    pool = ProcessPoolExecutor(max_workers=workers)
+    try:
+        n = len(rest[0])
+        parts = pool.map(
+            _chunk_sketch, [assumptions] * n, *rest, [years] * n, [sketch.edges] * n,
+            [sampler] * n, [antithetic] * n
+        )
+        for part in parts:
+            sketch.merge(part)
+            yield sketch
+    finally:
+        pool.shutdown(cancel_futures=True)
+
+
+def monte_carlo_dcf(assumptions, n_draws=1_000_000, years=5, chunk_size=DEFAULT_CHUNK_SIZE,
+                    seed=None, bins=DEFAULT_BINS, workers=None, sampler="random", antithetic=False,
+                    replicates=DEFAULT_REPLICATES):
+    """
+    Runs iter_monte_carlo_dcf to completion and returns the final ValuationSketch.
+    """
+    sketch = None
+    for sketch in iter_monte_carlo_dcf(assumptions, n_draws, years, chunk_size, seed, bins, workers,
+                                       sampler, antithetic, replicates):
+        pass
+    return sketch
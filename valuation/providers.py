@@ -0,0 +1,147 @@
+import json
+import os
+from abc import ABC, abstractmethod
+import pandas as pd
+import yfinance as yf
+
+try:
+    from yfinance.exceptions import YFRateLimitError
+except ImportError:  # older yfinance releases
+    YFRateLimitError = None
+
+# Transport errors from the HTTP clients yfinance may use: curl_cffi (1.x) or requests (older releases).
+# Neither derives from the builtin ConnectionError or TimeoutError.
+TRANSPORT_ERRORS = (ConnectionError, TimeoutError)
+HTTP_ERRORS = ()
+try:
+    from curl_cffi.requests import exceptions as curl_exceptions
+    TRANSPORT_ERRORS += (curl_exceptions.ConnectionError, curl_exceptions.Timeout)
+    HTTP_ERRORS += (curl_exceptions.HTTPError,)
+except ImportError:
+    pass
+try:
+    from requests import exceptions as requests_exceptions
+    TRANSPORT_ERRORS += (requests_exceptions.ConnectionError, requests_exceptions.Timeout)
+    HTTP_ERRORS += (requests_exceptions.HTTPError,)
+except ImportError:
+    pass
+
+STATEMENT_FIELDS = ("income", "cashflow", "balance")
+
+# yfinance attribute behind each field
+YF_FIELDS = {
+    "income": "financials",
+    "cashflow": "cashflow",
+    "balance": "balance_sheet",
+    "info": "info",
+}
+
+
+class DataProvider(ABC):
+    """
+    Source of raw financial data used by get_financials.
+    A provider must implement fetch(ticker, field) for field in income, cashflow, balance
+    (DataFrames with line items as the index and period end dates as columns) and info (a dict).
+    `cacheable` tells the data layer whether results are worth keeping in the on-disk cache
+    (cacheable providers are also rate limited and retried); is_retryable(exc) flags transient failures.
+    """
+
+    name = "base"
+    cacheable = True
+
+    @abstractmethod
+    def fetch(self, ticker, field):
+        pass
+
+    def is_retryable(self, exc):
+        return isinstance(exc, TRANSPORT_ERRORS)
+
+
+def _status_code(exc):
+    return getattr(getattr(exc, "response", None), "status_code", None)
+
+
+class YFinanceProvider(DataProvider):
+    """
+    Fetches from Yahoo Finance through yfinance.
+    yfinance hides request failures behind empty results by default, which would make throttling
+    look like missing data; the provider turns that off so failures raise and can be retried.
+    Rate limits, transport errors and 429/5xx responses are retryable; a 404 is an unknown symbol.
+    """
+
+    name = "yfinance"
+    cacheable = True
+
+    def __init__(self):
+        if hasattr(yf, "config"):
+            yf.config.debug.hide_exceptions = False
+
+    def fetch(self, ticker, field):
+        try:
+            value = getattr(yf.Ticker(ticker), YF_FIELDS[field])
+        except HTTP_ERRORS as exc:
+            if _status_code(exc) != 404:
+                raise
+            value = None
+        if value is None:
+            return {} if field == "info" else pd.DataFrame()
+        return value
+
+    def is_retryable(self, exc):
+        if YFRateLimitError is not None and isinstance(exc, YFRateLimitError):
+            return True
+        if isinstance(exc, HTTP_ERRORS):
+            status = _status_code(exc)
+            return status == 429 or (status is not None and status >= 500)
+        return super().is_retryable(exc)
+
+
+class FixtureProvider(DataProvider):
+    """
+    Reads statements and info from local files laid out as <root>/<TICKER>/<field>.parquet
+    or <field>.json, so the app and benchmarks run offline at deterministic speed.
+    Missing files behave like an unknown ticker upstream: an empty DataFrame or dict.
+    """
+
+    name = "fixtures"
+    cacheable = False
+
+    def __init__(self, root):
+        self.root = root
+
+    def _path(self, ticker, field, ext):
+        return os.path.join(self.root, ticker.upper(), f"{field}.{ext}")
+
+    def fetch(self, ticker, field):
+        if field == "info":
+            path = self._path(ticker, field, "json")
+            if not os.path.exists(path):
+                return {}
+            with open(path) as fh:
+                return json.load(fh)
+
+        parquet_path = self._path(ticker, field, "parquet")
+        json_path = self._path(ticker, field, "json")
+        if os.path.exists(parquet_path):
+            df = pd.read_parquet(parquet_path)
+        elif os.path.exists(json_path):
+            df = pd.read_json(json_path, orient="split")
+        else:
+            return pd.DataFrame()
+        # Both formats store period labels as strings; restore the Timestamps yfinance returns
+        df.columns = pd.to_datetime(df.columns)
+        return df
+
+
+def save_fixture(snapshot, root):
+    """
+    Writes every field of a FinancialSnapshot as JSON fixtures readable by FixtureProvider.
+    """
+    directory = os.path.join(root, snapshot.ticker)
+    os.makedirs(directory, exist_ok=True)
+    for field in STATEMENT_FIELDS:
+        df = getattr(snapshot, field).copy()
+        df.columns = [pd.Timestamp(c).isoformat() for c in df.columns]
+        df.to_json(os.path.join(directory, f"{field}.json"), orient="split")
+    with open(os.path.join(directory, "info.json"), "w") as fh:
+        json.dump(snapshot.info, fh, default=str)
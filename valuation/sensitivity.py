@@ -0,0 +1,89 @@
+import numpy as np
+import pandas as pd
+from valuation.dcf import dcf_batch
+
+PARAMETERS = ("growth", "discount", "terminal_growth", "exit_multiple", "years")
+
+
+class SensitivityGrid:
+    """
+    DCF values over a grid of assumptions, labeled by axis.
+    values[i, j, ...] is the valuation at the i-th coordinate of the first axis,
+    the j-th of the second, and so on.
+    """
+
+    def __init__(self, values, axes):
+        self.values = values
+        self.axes = axes
+
+    @property
+    def dims(self):
+        return tuple(name for name, _ in self.axes)
+
+    def coords(self, name):
+        return dict(self.axes)[name]
+
+
+def sensitivity_grid(fcf, axes, factors=None, **base):
+    """
+    Evaluates the DCF over every combination of `axes`, a mapping of parameter name
+    (growth, discount, terminal_growth, exit_multiple, years) to 1-D values, with the
+    remaining parameters held at their `base` values. Each axis becomes its own array
+    dimension so the whole grid is a single broadcast dcf_batch call.
+    Uses the exit multiple terminal value when exit_multiple is an axis or a base value.
+    `factors` is passed to dcf_batch unchanged, so it cannot be combined with a years axis.
+    """
+    names = list(axes)
+    unknown = [name for name in names + list(base) if name not in PARAMETERS]
+    if unknown:
+        raise ValueError(f"Unknown DCF parameter(s): {', '.join(unknown)}")
+
+    params = dict(base)
+    coords = []
+    for dim, name in enumerate(names):
+        values = np.asarray(axes[name])
+        shape = [1] * len(names)
+        shape[dim] = values.size
+        params[name] = values.reshape(shape)
+        coords.append((name, values))
+
+    values = np.broadcast_to(dcf_batch(fcf, factors=factors, **params), tuple(c.size for _, c in coords))
+    return SensitivityGrid(values, coords)
+
+
+def tornado(fcf, ranges, factors=None, **base):
+    """
+    One-at-a-time swings for a tornado chart.
+    `ranges` maps each parameter to perturb (fcf or any sensitivity_grid parameter) to its
+    (low, high) values; everything else stays at `base`. The base case and all 2 * N perturbed
+    cases are valued in one dcf_batch call, with `factors` passed through as in sensitivity_grid.
+    Returns (base_value, DataFrame) with one row per parameter sorted by swing, largest first.
+    """
+    params = {"fcf": fcf, **{name: value for name, value in base.items() if value is not None}}
+    unknown = [name for name in list(ranges) + list(base) if name not in PARAMETERS + ("fcf",)]
+    if unknown:
+        raise ValueError(f"Unknown DCF parameter(s): {', '.join(unknown)}")
+
+    names = list(ranges)
+    # A ranged parameter with no base value falls back to dcf_batch's default, if it has one
+    defaults = {"terminal_growth": 0.02, "years": 5}
+    for name in names:
+        if name not in params:
+            if name not in defaults:
+                raise ValueError(f"tornado needs a base value for ranged parameter {name!r}")
+            params[name] = defaults[name]
+    cases = 2 * len(names) + 1
+    columns = {name: np.full(cases, value, dtype=float) for name, value in params.items()}
+    for i, name in enumerate(names):
+        columns[name][2 * i + 1], columns[name][2 * i + 2] = ranges[name]
+    values = dcf_batch(factors=factors, **columns)
+
+    table = pd.DataFrame({
+        "parameter": names,
+        "low": [ranges[name][0] for name in names],
+        "high": [ranges[name][1] for name in names],
+        "low_value": values[1::2],
+        "high_value": values[2::2],
+    })
+    table["swing"] = (table["high_value"] - table["low_value"]).abs()
+    return values[0], table.sort_values("swing", ascending=False, ignore_index=True)
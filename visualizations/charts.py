@@ -1,6 +1,7 @@
 import plotly.graph_objects as go
 import numpy as np
 import plotly.express as px
+from valuation.sensitivity import sensitivity_grid, tornado
 
 def dcf_chart(projected, terminal, total_value):
     fig = go.Figure()
@@ -9,18 +10,16 @@ def dcf_chart(projected, terminal, total_value):
     fig.update_layout(title=f"DCF Breakdown (Total: ${total_value:,.0f})")
     return fig
 
-def render_sensitivity_heatmap(latest_fcf, discount_rate, terminal_growth, project_cash_flows, calculate_terminal_value, discounted_cash_flows):
+def render_sensitivity_heatmap(latest_fcf, discount_rate, terminal_growth, growth_rate):
     rates = np.linspace(discount_rate - 0.03, discount_rate + 0.03, 7)
     growths = np.linspace(terminal_growth - 0.01, terminal_growth + 0.01, 5)
 
-    Z = [[
-        discounted_cash_flows(
-            project_cash_flows(latest_fcf, g),
-            calculate_terminal_value(project_cash_flows(latest_fcf, g)[-1], g, r),
-            r
-        ) for r in rates] for g in growths]
+    grid = sensitivity_grid(
+        latest_fcf, {"terminal_growth": growths, "discount": rates},
+        growth=growth_rate
+    )
 
-    fig = px.imshow(Z,
+    fig = px.imshow(grid.values,
         x=[f"{r*100:.1f}%" for r in rates],
         y=[f"{g*100:.1f}%" for g in growths],
         labels={"x": "Discount Rate", "y": "Terminal Growth", "color": "Valuation ($)"},
@@ -28,21 +27,56 @@ def render_sensitivity_heatmap(latest_fcf, discount_rate, terminal_growth, proje
     )
     return fig
 
-def render_exit_multiple_heatmap(latest_fcf, discount_rate, exit_multiple, project_cash_flows, calculate_terminal_value_exit_multiple, discounted_cash_flows):
+def render_exit_multiple_heatmap(latest_fcf, discount_rate, exit_multiple, growth_rate=0.10):
     rates = np.linspace(discount_rate - 0.03, discount_rate + 0.03, 7)
     multiples = np.arange(exit_multiple - 5, exit_multiple + 6, 2)  # e.g., 7x to 17x
 
-    Z = [[
-        discounted_cash_flows(
-            project_cash_flows(latest_fcf, 0.10),  # Assume flat 10% growth
-            calculate_terminal_value_exit_multiple(project_cash_flows(latest_fcf, 0.10)[-1], m),
-            r
-        ) for r in rates] for m in multiples]
+    grid = sensitivity_grid(
+        latest_fcf, {"exit_multiple": multiples, "discount": rates},
+        growth=growth_rate
+    )
 
-    fig = px.imshow(Z,
+    fig = px.imshow(grid.values,
         x=[f"{r*100:.1f}%" for r in rates],
         y=[f"{m}x" for m in multiples],
         labels={"x": "Discount Rate", "y": "Exit Multiple", "color": "Valuation ($)"},
         title="Exit Multiple Sensitivity: Terminal Multiple vs WACC"
     )
-    return fig
\ No newline at end of file
+    return fig
+
+
+def render_tornado_chart(latest_fcf, growth_rate, discount_rate, terminal_growth, exit_multiple=None):
+    ranges = {
+        "fcf": (latest_fcf * 0.9, latest_fcf * 1.1),
+        "growth": (growth_rate - 0.02, growth_rate + 0.02),
+        "discount": (discount_rate - 0.01, discount_rate + 0.01),
+    }
+    if exit_multiple is None:
+        ranges["terminal_growth"] = (terminal_growth - 0.005, terminal_growth + 0.005)
+    else:
+        ranges["exit_multiple"] = (exit_multiple - 2, exit_multiple + 2)
+
+    base_value, table = tornado(
+        latest_fcf, ranges,
+        growth=growth_rate, discount=discount_rate, terminal_growth=terminal_growth, exit_multiple=exit_multiple
+    )
+
+    labels = {
+        "fcf": "Latest FCF (±10%)",
+        "growth": "FCF Growth (±2pp)",
+        "discount": "Discount Rate (±1pp)",
+        "terminal_growth": "Terminal Growth (±0.5pp)",
+        "exit_multiple": "Exit Multiple (±2x)",
+    }
+    table = table.iloc[::-1]  # plotly draws the first row at the bottom
+    y = [labels[p] for p in table["parameter"]]
+
+    fig = go.Figure()
+    fig.add_trace(go.Bar(y=y, x=table["low_value"] - base_value, base=base_value, orientation='h', name='Low input'))
+    fig.add_trace(go.Bar(y=y, x=table["high_value"] - base_value, base=base_value, orientation='h', name='High input'))
+    fig.update_layout(
+        barmode='overlay',
+        title=f"DCF Tornado: Impact of Each Input (Base: ${base_value:,.0f})",
+        xaxis_title="Valuation ($)"
+    )
+    return fig